@@ -1,12 +1,80 @@
 """Token-based text chunking."""
+import functools
 import hashlib
-from typing import Dict, List
+import itertools
+import os
+from typing import Dict, Iterable, Iterator, List, Tuple
+import numpy as np
 import tiktoken
 
 
+@functools.lru_cache(maxsize=8)
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding once per process and reuse it across chunkers."""
+    return tiktoken.get_encoding(encoding_name)
+
+
+def reset_encoding_cache() -> None:
+    """Clear the cached tiktoken encodings (mainly useful in tests)."""
+    _get_encoding.cache_clear()
+
+
+def batched(iterable: Iterable, n: int) -> Iterator[list]:
+    """
+    Yield successive lists of up to n items (itertools.batched for Python < 3.12).
+
+    Args:
+        iterable: Items to group
+        n: Maximum batch size
+
+    Yields:
+        Lists of at most n items
+    """
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, n)):
+        yield batch
+
+
+def _compute_boundaries(n_tokens: int, chunk_size: int, chunk_overlap: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute chunk start/end token offsets with vectorized arithmetic.
+
+    Args:
+        n_tokens: Number of tokens in the document
+        chunk_size: Maximum number of tokens per chunk
+        chunk_overlap: Number of overlapping tokens between chunks
+
+    Returns:
+        Tuple of int64 (starts, ends) arrays
+    """
+    stride = max(1, chunk_size - chunk_overlap)
+    starts = np.arange(0, n_tokens, stride, dtype=np.int64)
+    ends = np.minimum(starts + chunk_size, n_tokens)
+
+    # Stop at the first chunk that reaches the end of the document
+    n_chunks = int(np.searchsorted(ends, n_tokens)) + 1
+    return starts[:n_chunks], ends[:n_chunks]
+
+
 class TokenBasedChunker:
     """Chunk text based on token count with overlap."""
 
+    # Parent document fields copied into each chunk (everything ChromaService
+    # and the citation code read); large fields like 'content' are left out
+    _INHERITED_KEYS = (
+        "doc_id",
+        "filename",
+        "source",
+        "content_hash",
+        "file_type",
+        "page",
+        "total_pages",
+        "section",
+        "section_number",
+        "row",
+        "total_rows",
+    )
+
     def __init__(self, chunk_size: int = 512, chunk_overlap: int = 50, encoding_name: str = "cl100k_base"):
         """
         Initialize the chunker.
@@ -18,78 +86,122 @@ class TokenBasedChunker:
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.encoding = _get_encoding(encoding_name)
+        # Per-instance memo for count_tokens; holds at most 4096 distinct strings
+        self._cached_token_count = functools.lru_cache(maxsize=4096)(self._token_count)
 
-    def chunk_documents(self, documents: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    def chunk_documents(self, documents: List[Dict[str, str]]) -> Iterator[Dict[str, str]]:
         """
         Chunk a list of documents.
 
+        Chunks are yielded lazily so callers can embed and store them in
+        bounded batches (see iter_chunk_batches) instead of materializing
+        every chunk.
+
         Args:
             documents: List of document dictionaries with 'content' and metadata
 
-        Returns:
-            List of chunk dictionaries with metadata
+        Yields:
+            Chunk dictionaries with metadata
         """
-        all_chunks = []
+        # Tokenize every non-empty document in one batched call so tiktoken can
+        # spread the work across its thread pool instead of one FFI call per doc
+        non_empty_docs = [doc for doc in documents if doc.get("content", "").strip()]
+        if not non_empty_docs:
+            return
 
-        for doc in documents:
-            chunks = self._chunk_single_document(doc)
-            all_chunks.extend(chunks)
+        tokens_list = self.encoding.encode_ordinary_batch(
+            [doc["content"] for doc in non_empty_docs],
+            num_threads=max(1, os.cpu_count() or 1),
+        )
 
-        return all_chunks
+        for doc, tokens in zip(non_empty_docs, tokens_list):
+            yield from self._iter_chunks_from_tokens(doc, tokens)
 
-    def _chunk_single_document(self, document: Dict[str, str]) -> List[Dict[str, str]]:
+    def chunk_documents_soa(self, documents: Iterable[Dict[str, str]]) -> Tuple[List[str], List[Dict], List[str]]:
         """
-        Chunk a single document.
+        Chunk documents into parallel lists instead of one dict per chunk.
+
+        Holds every chunk at once; for large ingests use iter_chunk_batches.
 
         Args:
-            document: Document dictionary with 'content' and metadata
+            documents: Document dictionaries with 'content' and metadata
 
         Returns:
-            List of chunk dictionaries
+            Tuple of (chunk texts, chunk metadata dicts, chunk IDs); the
+            metadata dicts hold every chunk field except text and ID
         """
-        content = document.get("content", "")
-        if not content.strip():
-            return []
+        return self._to_soa(self.chunk_documents(list(documents)))
 
-        # Encode text to tokens
-        tokens = self.encoding.encode(content)
+    def iter_chunk_batches(
+        self, documents: Iterable[Dict[str, str]], batch_size: int
+    ) -> Iterator[Tuple[List[str], List[Dict], List[str]]]:
+        """
+        Chunk documents lazily into batches of parallel lists.
 
-        chunks = []
-        start_idx = 0
+        Each batch's texts can go straight to EmbeddingService.embed_batch and
+        all three lists to ChromaService.add_chunks_soa; only the current
+        batch's chunks exist at a time.
 
-        while start_idx < len(tokens):
-            # Calculate end index
-            end_idx = min(start_idx + self.chunk_size, len(tokens))
+        Args:
+            documents: Document dictionaries with 'content' and metadata
+            batch_size: Maximum chunks per batch
 
-            # Extract chunk tokens
-            chunk_tokens = tokens[start_idx:end_idx]
+        Yields:
+            Tuples of (chunk texts, chunk metadata dicts, chunk IDs)
+        """
+        for chunks in batched(self.chunk_documents(list(documents)), batch_size):
+            yield self._to_soa(chunks)
 
-            # Decode back to text
-            chunk_text = self.encoding.decode(chunk_tokens)
+    @staticmethod
+    def _to_soa(chunks: Iterable[Dict[str, str]]) -> Tuple[List[str], List[Dict], List[str]]:
+        """Split chunk dicts into (texts, metadata dicts, IDs) parallel lists."""
+        texts = []
+        metadatas = []
+        ids = []
 
-            # Create chunk metadata
-            chunk_id = self._generate_chunk_id(document, start_idx)
+        for chunk in chunks:
+            texts.append(chunk.pop("chunk_text"))
+            ids.append(chunk.pop("chunk_id"))
+            metadatas.append(chunk)
 
-            chunk = {
-                **document,  # Inherit all metadata from parent document
-                "chunk_id": chunk_id,
-                "chunk_text": chunk_text,
-                "chunk_index": len(chunks),
-                "start_token": start_idx,
-                "end_token": end_idx,
-                "total_tokens": len(chunk_tokens),
-            }
+        return texts, metadatas, ids
+
+    def _iter_chunks_from_tokens(self, document: Dict[str, str], tokens: List[int]) -> Iterator[Dict[str, str]]:
+        """
+        Build chunks from a document's precomputed tokens.
 
-            chunks.append(chunk)
+        Args:
+            document: Document dictionary with 'content' and metadata
+            tokens: Token ids for the document content
+
+        Yields:
+            Chunk dictionaries
+        """
+        # Compute all chunk boundaries up front
+        starts, ends = _compute_boundaries(len(tokens), self.chunk_size, self.chunk_overlap)
+        boundaries = list(zip(starts.tolist(), ends.tolist()))
 
-            # Move to next chunk with overlap
-            if end_idx >= len(tokens):
-                break
+        # Decode all chunks in a single batched call
+        chunk_texts = self.encoding.decode_batch([tokens[start:end] for start, end in boundaries])
 
-            start_idx = end_idx - self.chunk_overlap
+        # Document-level part of the chunk ID is the same for every chunk
+        id_prefix = self._chunk_id_prefix(document)
 
-        return chunks
+        # Parent metadata inherited by every chunk; the full content is dropped
+        # since each chunk carries its own chunk_text
+        base = {k: document[k] for k in self._INHERITED_KEYS if k in document}
+
+        for chunk_index, ((start_idx, end_idx), chunk_text) in enumerate(zip(boundaries, chunk_texts)):
+            # Create chunk metadata
+            yield base | {
+                "chunk_id": f"{id_prefix}_{start_idx}",
+                "chunk_text": chunk_text,
+                "chunk_index": chunk_index,
+                "start_token": start_idx,
+                "end_token": end_idx,
+                "total_tokens": end_idx - start_idx,
+            }
 
     @staticmethod
     def _generate_chunk_id(document: Dict[str, str], start_token: int) -> str:
@@ -103,28 +215,53 @@ class TokenBasedChunker:
         Returns:
             Unique chunk identifier
         """
+        return f"{TokenBasedChunker._chunk_id_prefix(document)}_{start_token}"
+
+    @staticmethod
+    def _chunk_id_prefix(document: Dict[str, str]) -> str:
+        """
+        Build the per-document part of a chunk ID.
+
+        The document identity (doc_id, full content hash, and page/section/row)
+        is hashed once with a 64-bit BLAKE2b digest, which is far less likely to
+        collide than a truncated 8-hex-char content hash.
+
+        Args:
+            document: Parent document
+
+        Returns:
+            Chunk ID prefix shared by every chunk of the document
+        """
         doc_id = document.get("doc_id", "unknown")
-        content_hash = document.get("content_hash", "")[:8]
 
         # Add page/section/row identifier to ensure uniqueness across multi-part documents
         location_id = ""
         if "page" in document:
-            location_id = f"_p{document['page']}"
+            location_id = f"p{document['page']}"
         elif "section_number" in document:
-            location_id = f"_s{document['section_number']}"
+            location_id = f"s{document['section_number']}"
         elif "row" in document:
-            location_id = f"_r{document['row']}"
+            location_id = f"r{document['row']}"
 
-        return f"{doc_id}_{content_hash}{location_id}_{start_token}"
+        key = f"{doc_id}|{document.get('content_hash', '')}|{location_id}".encode()
+        return f"{doc_id}_{hashlib.blake2b(key, digest_size=8).hexdigest()}"
 
     def count_tokens(self, text: str) -> int:
         """
         Count tokens in text.
 
+        Special-token markers are counted as ordinary text, consistent with
+        how documents are chunked. Results are memoized per chunker in an
+        LRU cache of up to 4096 strings.
+
         Args:
             text: Input text
 
         Returns:
             Number of tokens
         """
-        return len(self.encoding.encode(text))
+        return self._cached_token_count(text)
+
+    def _token_count(self, text: str) -> int:
+        """Uncached token count backing count_tokens."""
+        return len(self.encoding.encode_ordinary(text))
@@ -1,5 +1,6 @@
 """Automatic cleanup utilities for temporary data management."""
 import os
+import threading
 import time
 from pathlib import Path
 from typing import Optional
@@ -9,10 +10,38 @@ import shutil
 logger = logging.getLogger(__name__)
 
 
+def _scan_files(directory: Path, recursive: bool = False) -> tuple[int, int]:
+    """
+    Count files and total bytes under a directory using os.scandir.
+
+    Args:
+        directory: Directory to scan
+        recursive: Whether to descend into subdirectories
+
+    Returns:
+        Tuple of (file_count, total_bytes), ignoring .gitkeep files
+    """
+    file_count = 0
+    total_bytes = 0
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive:
+                    sub_count, sub_bytes = _scan_files(entry.path, recursive=True)
+                    file_count += sub_count
+                    total_bytes += sub_bytes
+            elif entry.is_file() and entry.name != ".gitkeep":
+                file_count += 1
+                total_bytes += entry.stat().st_size
+
+    return file_count, total_bytes
+
+
 class DataCleanupManager:
     """Manages automatic cleanup of uploaded files and database."""
 
-    def __init__(self, upload_dir: Path, chroma_dir: Path, max_age_hours: float = 1.0):
+    def __init__(self, upload_dir: Path, chroma_dir: Path, max_age_hours: float = 1.0, use_dir_fd: bool = True):
         """
         Initialize cleanup manager.
 
@@ -20,10 +49,12 @@ class DataCleanupManager:
             upload_dir: Directory for uploaded files
             chroma_dir: Directory for ChromaDB
             max_age_hours: Maximum age of files in hours before cleanup (supports decimals)
+            use_dir_fd: Scan and unlink uploads relative to an open directory fd where supported
         """
         self.upload_dir = upload_dir
         self.chroma_dir = chroma_dir
         self.max_age_seconds = max_age_hours * 3600
+        self.use_dir_fd = use_dir_fd and os.scandir in os.supports_fd and os.unlink in os.supports_dir_fd
 
     def cleanup_old_uploads(self) -> tuple[int, int]:
         """
@@ -35,24 +66,36 @@ class DataCleanupManager:
         files_deleted = 0
         bytes_freed = 0
         current_time = time.time()
+        dir_fd = None
 
         try:
-            for file_path in self.upload_dir.glob("*"):
-                if file_path.name == ".gitkeep":
-                    continue
-
-                if file_path.is_file():
-                    file_age = current_time - file_path.stat().st_mtime
+            # With a directory fd, stat/unlink become fstatat/unlinkat calls that
+            # skip re-resolving the full path for every entry
+            if self.use_dir_fd:
+                dir_fd = os.open(self.upload_dir, os.O_RDONLY | os.O_DIRECTORY)
+
+            with os.scandir(self.upload_dir if dir_fd is None else dir_fd) as entries:
+                for entry in entries:
+                    if entry.name == ".gitkeep" or not entry.is_file():
+                        continue
+
+                    # Single stat per file; reuse it for both age and size
+                    st = entry.stat()
+                    file_age = current_time - st.st_mtime
                     if file_age > self.max_age_seconds:
-                        file_size = file_path.stat().st_size
-                        file_path.unlink()
+                        # entry.path is relative to dir_fd when scanning by fd
+                        os.unlink(entry.path, dir_fd=dir_fd)
                         files_deleted += 1
-                        bytes_freed += file_size
-                        logger.info(f"Deleted old file: {file_path.name} (age: {file_age/3600:.1f}h)")
+                        bytes_freed += st.st_size
+                        logger.info(f"Deleted old file: {entry.name} (age: {file_age/3600:.1f}h)")
 
         except Exception as e:
             logger.error(f"Error during upload cleanup: {e}")
 
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+
         return files_deleted, bytes_freed
 
     def cleanup_old_chroma_data(self) -> bool:
@@ -65,19 +108,24 @@ class DataCleanupManager:
         try:
             # Check if chroma directory has old data
             chroma_db_file = self.chroma_dir / "chroma.sqlite3"
-            if chroma_db_file.exists():
-                current_time = time.time()
-                db_age = current_time - chroma_db_file.stat().st_mtime
+            try:
+                db_mtime = os.stat(chroma_db_file).st_mtime
+            except FileNotFoundError:
+                db_mtime = None
+
+            if db_mtime is not None:
+                db_age = time.time() - db_mtime
 
                 if db_age > self.max_age_seconds:
                     # Remove all ChromaDB data
-                    for item in self.chroma_dir.glob("*"):
-                        if item.name == ".gitkeep":
-                            continue
-                        if item.is_file():
-                            item.unlink()
-                        elif item.is_dir():
-                            shutil.rmtree(item)
+                    with os.scandir(self.chroma_dir) as entries:
+                        for entry in entries:
+                            if entry.name == ".gitkeep":
+                                continue
+                            if entry.is_dir(follow_symlinks=False):
+                                shutil.rmtree(entry.path)
+                            else:
+                                os.unlink(entry.path)
                     logger.info(f"Cleaned ChromaDB data (age: {db_age/3600:.1f}h)")
                     return True
 
@@ -102,15 +150,13 @@ class DataCleanupManager:
 
         try:
             # Count uploads
-            for file_path in self.upload_dir.glob("*"):
-                if file_path.is_file() and file_path.name != ".gitkeep":
-                    stats["upload_count"] += 1
-                    stats["upload_size_mb"] += file_path.stat().st_size / (1024 * 1024)
+            upload_count, upload_bytes = _scan_files(self.upload_dir, recursive=False)
+            stats["upload_count"] = upload_count
+            stats["upload_size_mb"] = upload_bytes / (1024 * 1024)
 
             # Count ChromaDB size
-            for item in self.chroma_dir.rglob("*"):
-                if item.is_file() and item.name != ".gitkeep":
-                    stats["chroma_size_mb"] += item.stat().st_size / (1024 * 1024)
+            _, chroma_bytes = _scan_files(self.chroma_dir, recursive=True)
+            stats["chroma_size_mb"] = chroma_bytes / (1024 * 1024)
 
             stats["total_size_mb"] = stats["upload_size_mb"] + stats["chroma_size_mb"]
 
@@ -171,19 +217,23 @@ class DataCleanupManager:
         return results
 
 
-def schedule_cleanup(cleanup_manager: DataCleanupManager, interval_minutes: int = 60):
+def schedule_cleanup(cleanup_manager: DataCleanupManager, interval_minutes: int = 60) -> threading.Event:
     """
     Background cleanup scheduler (for production deployment).
 
     Args:
         cleanup_manager: CleanupManager instance
         interval_minutes: Cleanup interval in minutes
+
+    Returns:
+        Event that stops the scheduler when set
     """
-    import threading
+    stop_event = threading.Event()
 
     def cleanup_job():
-        while True:
-            time.sleep(interval_minutes * 60)
+        # Event.wait returns True as soon as the event is set, so shutdown
+        # doesn't have to wait out a full interval
+        while not stop_event.wait(interval_minutes * 60):
             logger.info("Running scheduled cleanup...")
             cleanup_manager.full_cleanup()
             cleanup_manager.enforce_storage_limits()
@@ -191,3 +241,6 @@ def schedule_cleanup(cleanup_manager: DataCleanupManager, interval_minutes: int
     thread = threading.Thread(target=cleanup_job, daemon=True)
     thread.start()
     logger.info(f"Cleanup scheduler started (interval: {interval_minutes} minutes)")
+
+    return stop_event
+
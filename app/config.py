@@ -22,6 +22,8 @@ class Settings(BaseSettings):
     DEFAULT_CHUNK_OVERLAP: int = 50  # tokens
     MIN_CHUNK_SIZE: int = 100
     MAX_CHUNK_SIZE: int = 2000
+    MAX_EMBED_BATCH: int = 1024  # max chunks embedded and stored per step during ingest
+    PROCESS_CONCURRENCY: int = 8  # files processed in parallel per upload batch
 
     # Retrieval settings
     DEFAULT_TOP_K: int = 5
@@ -38,6 +40,7 @@ class Settings(BaseSettings):
 
     # Supported file types
     SUPPORTED_EXTENSIONS: set = {".pdf", ".md", ".csv", ".txt"}
+    CSV_USE_PYARROW: bool = Field(default=True, env="CSV_USE_PYARROW")  # Parse CSVs with pyarrow (pandas fallback when False)
 
     # Cleanup settings (for portfolio/demo deployment)
     ENABLE_AUTO_CLEANUP: bool = Field(default=True, env="ENABLE_AUTO_CLEANUP")
@@ -1,6 +1,7 @@
 """Embedding generation service using sentence-transformers."""
 from typing import List, Union
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 import logging
 
@@ -10,18 +11,46 @@ logger = logging.getLogger(__name__)
 class EmbeddingService:
     """Service for generating text embeddings."""
 
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        half_precision: bool = True,
+        cpu_bf16: bool = False,
+        normalize: bool = True,
+    ):
         """
         Initialize the embedding service.
 
         Args:
             model_name: Name of the sentence-transformers model to use
+            half_precision: Run inference in fp16 on CUDA devices
+            cpu_bf16: Also run in bf16 on CPUs with AMX; needs a sentence-transformers
+                release that upcasts bf16 output in convert_to_numpy
+            normalize: L2-normalize embeddings at encode time so cosine similarity is a dot product
         """
         self.model_name = model_name
+        self._normalized = normalize
         logger.info(f"Loading embedding model: {model_name}")
         self.model = SentenceTransformer(model_name)
+        # Cached: the dimension is fixed for a loaded model
+        self._dim = self.model.get_sentence_embedding_dimension()
+        if half_precision:
+            self._enable_half_precision(cpu_bf16)
         logger.info(f"Model loaded successfully. Embedding dimension: {self.get_dimension()}")
 
+    def _enable_half_precision(self, cpu_bf16: bool = False) -> None:
+        """Cast model weights to fp16 on CUDA, or to bf16 on AMX CPUs when cpu_bf16 is set."""
+        try:
+            if self.model.device.type == "cuda":
+                self.model = self.model.half()
+                logger.info("Embedding model running in fp16")
+            elif cpu_bf16 and torch.cpu._is_amx_tile_supported():
+                # bf16 is only faster than fp32 on CPUs with AMX tiles
+                self.model = self.model.bfloat16()
+                logger.info("Embedding model running in bf16")
+        except Exception as e:
+            logger.warning(f"Half precision unavailable, using fp32: {e}")
+
     def embed_text(self, text: str) -> List[float]:
         """
         Generate embedding for a single text.
@@ -36,8 +65,9 @@ class EmbeddingService:
             # Return zero vector for empty text
             return [0.0] * self.get_dimension()
 
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        # Upcast so half-precision models still yield fp32 vectors
+        embedding = self.model.encode(text, convert_to_numpy=True, normalize_embeddings=self._normalized)
+        return embedding.astype(np.float32).tolist()
 
     def embed_batch(self, texts: List[str], batch_size: int = 32, show_progress: bool = False) -> List[List[float]]:
         """
@@ -54,29 +84,35 @@ class EmbeddingService:
         if not texts:
             return []
 
-        # Filter out empty texts but maintain indices
-        non_empty_indices = [i for i, t in enumerate(texts) if t and t.strip()]
-        non_empty_texts = [texts[i] for i in non_empty_indices]
-
-        # Generate embeddings for non-empty texts
-        embeddings = self.model.encode(
-            non_empty_texts,
-            batch_size=batch_size,
-            show_progress_bar=show_progress,
-            convert_to_numpy=True,
-        )
-
-        # Reconstruct full embedding list with zeros for empty texts
-        full_embeddings = []
-        zero_embedding = [0.0] * self.get_dimension()
-        non_empty_idx = 0
-
-        for i in range(len(texts)):
-            if i in non_empty_indices:
-                full_embeddings.append(embeddings[non_empty_idx].tolist())
-                non_empty_idx += 1
-            else:
-                full_embeddings.append(zero_embedding)
+        return self.embed_batch_np(texts, batch_size=batch_size, show_progress=show_progress).tolist()
+
+    def embed_batch_np(self, texts: List[str], batch_size: int = 32, show_progress: bool = False) -> np.ndarray:
+        """
+        Generate embeddings for a batch of texts as a numpy array.
+
+        Args:
+            texts: List of input texts
+            batch_size: Batch size for encoding
+            show_progress: Whether to show progress bar
+
+        Returns:
+            float32 array of shape (len(texts), dimension); empty texts map to zero rows
+        """
+        # Mask out empty texts; their rows stay as zero vectors
+        mask = np.fromiter((bool(t and t.strip()) for t in texts), dtype=bool, count=len(texts))
+        full_embeddings = np.zeros((len(texts), self.get_dimension()), dtype=np.float32)
+
+        # Generate embeddings for non-empty texts. SentenceTransformer.encode
+        # already length-sorts its input before batching (and restores the
+        # original order), so padding waste is minimal without presorting here.
+        if mask.any():
+            full_embeddings[mask] = self.model.encode(
+                [t for t, keep in zip(texts, mask) if keep],
+                batch_size=batch_size,
+                show_progress_bar=show_progress,
+                convert_to_numpy=True,
+                normalize_embeddings=self._normalized,
+            )
 
         return full_embeddings
 
@@ -87,21 +123,26 @@ class EmbeddingService:
         Returns:
             Embedding vector dimension
         """
-        return self.model.get_sentence_embedding_dimension()
+        return self._dim
 
-    def similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
+    def similarity(self, embedding1: Union[List[float], np.ndarray], embedding2: Union[List[float], np.ndarray]) -> float:
         """
         Calculate cosine similarity between two embeddings.
 
+        Works for vectors of any length; for embeddings known to be unit
+        length (this service's output with normalize=True) similarity_normalized
+        skips the norms.
+
         Args:
-            embedding1: First embedding vector
-            embedding2: Second embedding vector
+            embedding1: First embedding vector (list or numpy array)
+            embedding2: Second embedding vector (list or numpy array)
 
         Returns:
             Cosine similarity score
         """
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
+        # np.asarray is a no-op for arrays, so only lists get converted
+        vec1 = np.asarray(embedding1)
+        vec2 = np.asarray(embedding2)
 
         dot_product = np.dot(vec1, vec2)
         norm1 = np.linalg.norm(vec1)
@@ -111,3 +152,17 @@ class EmbeddingService:
             return 0.0
 
         return float(dot_product / (norm1 * norm2))
+
+    @staticmethod
+    def similarity_normalized(embedding1: np.ndarray, embedding2: np.ndarray) -> float:
+        """
+        Cosine similarity for unit-length embeddings (a plain dot product).
+
+        Args:
+            embedding1: First normalized embedding vector
+            embedding2: Second normalized embedding vector
+
+        Returns:
+            Cosine similarity score
+        """
+        return float(np.dot(embedding1, embedding2))
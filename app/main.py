@@ -2,9 +2,26 @@
 import streamlit as st
 import logging
 from pathlib import Path
+import bisect
+import functools
 import hashlib
-from typing import List, Dict, Any
+import itertools
+import json
+import mmap
+import os
+import shutil
+import tempfile
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
 
 # Import application modules
 from config import settings
@@ -28,6 +45,23 @@ st.set_page_config(
 )
 
 
+# Bundled sample onboarding guide, resolved once per process
+DEMO_FILE_PATH = settings.BASE_DIR / "demo_content" / "data_scientist_onboarding.md"
+DEMO_PREVIEW_CHARS = 4096  # Demo content shown in Tab 4 before "Load full preview"
+
+
+@st.cache_data(ttl=3600)
+def _demo_exists() -> bool:
+    """Whether the demo file is present (cached so reruns don't re-stat it)."""
+    return DEMO_FILE_PATH.exists()
+
+
+@st.cache_data(ttl=3600)
+def _demo_markdown() -> str:
+    """Demo file contents (cached so reruns don't re-read it)."""
+    return DEMO_FILE_PATH.read_text(encoding="utf-8")
+
+
 def initialize_session_state():
     """Initialize Streamlit session state variables."""
     if "chroma_service" not in st.session_state:
@@ -37,9 +71,11 @@ def initialize_session_state():
     if "qa_service" not in st.session_state:
         st.session_state.qa_service = None
     if "indexed_files" not in st.session_state:
-        st.session_state.indexed_files = set()
+        # Kept sorted and unique by mark_indexed, so rendering needs no sort
+        st.session_state.indexed_files = []
     if "processing_log" not in st.session_state:
-        st.session_state.processing_log = []
+        # Bounded: only the most recent entries are ever shown
+        st.session_state.processing_log = deque(maxlen=100)
     if "last_chunk_size" not in st.session_state:
         st.session_state.last_chunk_size = settings.DEFAULT_CHUNK_SIZE
     if "last_chunk_overlap" not in st.session_state:
@@ -63,29 +99,187 @@ def initialize_session_state():
             logger.info("Auto-cleanup enabled")
 
 
-def get_file_hash(file_bytes: bytes) -> str:
-    """Calculate hash of file content."""
+def mark_indexed(filename: str) -> None:
+    """Add a filename to st.session_state.indexed_files, keeping it sorted and unique."""
+    indexed_files = st.session_state.indexed_files
+    pos = bisect.bisect_left(indexed_files, filename)
+    if pos == len(indexed_files) or indexed_files[pos] != filename:
+        indexed_files.insert(pos, filename)
+
+
+def get_file_hash(file_bytes: Optional[bytes] = None, file_path: Optional[Path] = None) -> str:
+    """
+    Calculate hash of file content.
+
+    Files on disk are memory-mapped so OpenSSL hashes the page cache directly,
+    with no copy into a Python buffer. In-memory bytes are hashed in place.
+    """
+    if file_path is not None:
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # Empty files can't be mmapped
+                return hashlib.sha256(b"").hexdigest()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
     return hashlib.sha256(file_bytes).hexdigest()
 
 
+# Parser for each supported file extension
+_PARSERS = {
+    ".pdf": PDFParser.parse,
+    ".md": MarkdownParser.parse,
+    ".txt": MarkdownParser.parse,
+    ".csv": functools.partial(CSVParser.parse, use_pyarrow=settings.CSV_USE_PYARROW),
+}
+
+
 def parse_document(file_path: Path) -> List[Dict[str, Any]]:
     """Parse document based on file type."""
     suffix = file_path.suffix.lower()
 
     try:
-        if suffix == ".pdf":
-            return PDFParser.parse(file_path)
-        elif suffix == ".md" or suffix == ".txt":
-            return MarkdownParser.parse(file_path)
-        elif suffix == ".csv":
-            return CSVParser.parse(file_path)
-        else:
+        parser = _PARSERS.get(suffix)
+        if parser is None:
             raise ValueError(f"Unsupported file type: {suffix}")
+        return parser(file_path)
     except Exception as e:
         logger.error(f"Error parsing {file_path.name}: {str(e)}")
         raise
 
 
+def index_chunks(
+    batches: Iterable[Tuple[List[str], List[Dict[str, Any]], List[str]]],
+    embeddings: Optional[np.ndarray] = None,
+) -> Dict[str, int]:
+    """
+    Embed and store chunks one batch at a time.
+
+    Batches come as parallel lists (see TokenBasedChunker.iter_chunk_batches)
+    and may mix several files; each batch is embedded with a single
+    embed_batch call regardless of file boundaries and stored before the
+    next one is built, so only one batch of texts and embeddings is alive
+    at a time.
+
+    Args:
+        batches: (texts, metadatas, ids) tuples of aligned chunk data
+        embeddings: Precomputed embeddings aligned with the concatenated
+            batches; when given, the embedding model is not called
+
+    Returns:
+        Number of chunks indexed per content_hash
+    """
+    embedding_service = st.session_state.embedding_service
+    chroma_service = st.session_state.chroma_service
+    chunk_counts = Counter()
+    stored_ids = []
+    offset = 0
+
+    try:
+        for texts, metadatas, ids in batches:
+            if embeddings is None:
+                batch_embeddings = embedding_service.embed_batch_np(texts, show_progress=False)
+            else:
+                batch_embeddings = embeddings[offset : offset + len(ids)]
+            offset += len(ids)
+            # Hand Chroma one contiguous (N, dim) float32 buffer instead of nested lists
+            batch_embeddings = np.ascontiguousarray(batch_embeddings, dtype=np.float32)
+
+            # Format each chunk's citation label once here rather than on every question
+            for metadata in metadatas:
+                metadata["display_source"] = QAService.format_source_info(metadata)
+
+            stored_ids.extend(ids)
+            chroma_service.add_chunks_soa(texts, metadatas, ids, batch_embeddings)
+            chunk_counts.update(metadata.get("content_hash", "") for metadata in metadatas)
+    except Exception:
+        # Roll back partial inserts so a retry isn't skipped as "already indexed"
+        chroma_service.delete_by_ids(stored_ids)
+        raise
+
+    return dict(chunk_counts)
+
+
+def _demo_cache_path(file_hash: str, chunk_size: int, chunk_overlap: int) -> Path:
+    """
+    Path of the cached demo chunks/embeddings for one file version and setup.
+
+    The name is keyed on the demo file's SHA-256 plus everything else that
+    changes the output (embedding model and chunking parameters).
+    """
+    key = hashlib.sha256(f"{file_hash}|{settings.EMBEDDING_MODEL}|{chunk_size}|{chunk_overlap}".encode()).hexdigest()
+    return settings.CHROMA_DIR / f"demo_cache_{key}.npz"
+
+
+def load_demo_chunks(demo_file_path: Path, file_hash: str, chunk_size: int, chunk_overlap: int):
+    """
+    Get the demo file's chunks and embeddings, reusing the on-disk cache.
+
+    The demo content never changes, so after the first embed the results are
+    saved next to the Chroma data and later cold starts skip parsing,
+    chunking, and the embedding forward pass. Embeddings are cached as
+    float16, half the size of float32, and upcast again when loaded.
+
+    Returns:
+        Tuple of (texts, metadatas, ids, float32 embeddings array)
+    """
+    cache_path = _demo_cache_path(file_hash, chunk_size, chunk_overlap)
+
+    try:
+        with np.load(cache_path) as cached:
+            # Stored as UTF-8 bytes; caches written before that hold a str
+            chunks = (orjson or json).loads(cached["chunks_json"].item())
+            logger.info(f"Loaded cached demo embeddings: {cache_path.name}")
+            return chunks["texts"], chunks["metadatas"], chunks["ids"], cached["embeddings"].astype(np.float32)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable demo cache {cache_path.name}: {e}")
+
+    # Save temporarily for parsing. On Linux shutil.copyfile copies with
+    # os.sendfile, so the bytes never pass through user space; the demo hash
+    # was already taken from an mmap of the file (see get_file_hash)
+    temp_path = settings.UPLOAD_DIR / demo_file_path.name
+    shutil.copyfile(demo_file_path, temp_path)
+
+    # Parse, chunk, and embed
+    documents = parse_document(temp_path)
+    chunker = TokenBasedChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    texts, metadatas, ids = chunker.chunk_documents_soa(documents)
+    embeddings = st.session_state.embedding_service.embed_batch_np(texts, show_progress=False)
+
+    try:
+        chunks = {"texts": texts, "metadatas": metadatas, "ids": ids}
+        # UTF-8 bytes: a str would be saved as a UCS-4 array, 4 bytes per character
+        chunks_json = orjson.dumps(chunks) if orjson is not None else json.dumps(chunks).encode("utf-8")
+        np.savez(cache_path, embeddings=embeddings.astype(np.float16), chunks_json=chunks_json)
+    except Exception as e:
+        logger.warning(f"Could not write demo cache {cache_path.name}: {e}")
+
+    return texts, metadatas, ids, embeddings
+
+
+def index_demo_content(chunk_size: int, chunk_overlap: int) -> Optional[int]:
+    """
+    Index the demo file, taking its chunks and embeddings from the on-disk cache when present.
+
+    Returns:
+        Number of chunks indexed, or None if the demo was already indexed
+    """
+    # Hash demo file straight from disk
+    file_hash = get_file_hash(file_path=DEMO_FILE_PATH)
+
+    # Check if already indexed
+    if st.session_state.chroma_service.check_document_exists(file_hash):
+        mark_indexed(DEMO_FILE_PATH.name)
+        return None
+
+    # Chunk and embed (or load both from the cache), then add to vector database
+    texts, metadatas, ids, embeddings = load_demo_chunks(DEMO_FILE_PATH, file_hash, chunk_size, chunk_overlap)
+    index_chunks([(texts, metadatas, ids)], embeddings)
+    mark_indexed(DEMO_FILE_PATH.name)
+    return len(ids)
+
+
 def auto_load_demo_content(chunk_size: int, chunk_overlap: int) -> bool:
     """
     Automatically load demo content on first launch.
@@ -105,83 +299,106 @@ def auto_load_demo_content(chunk_size: int, chunk_overlap: int) -> bool:
     if st.session_state.get("demo_auto_loaded", False):
         return False
 
-    demo_file_path = settings.BASE_DIR / "demo_content" / "data_scientist_onboarding.md"
-    if not demo_file_path.exists():
+    if not _demo_exists():
         return False
 
     try:
         st.session_state.demo_auto_loaded = True
 
-        # Read demo file
-        with open(demo_file_path, "rb") as f:
-            file_bytes = f.read()
+        if index_demo_content(chunk_size, chunk_overlap) is None:
+            return False
 
-        file_hash = get_file_hash(file_bytes)
+        logger.info(f"Auto-loaded demo content: {DEMO_FILE_PATH.name}")
+        return True
 
-        # Check if already indexed
-        if st.session_state.chroma_service.check_document_exists(file_hash):
-            st.session_state.indexed_files.add(demo_file_path.name)
-            return False
+    except Exception as e:
+        logger.error(f"Error auto-loading demo content: {str(e)}")
+        return False
 
-        # Initialize chunker
-        chunker = TokenBasedChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
-        # Save temporarily for parsing
-        temp_path = settings.UPLOAD_DIR / demo_file_path.name
-        with open(temp_path, "wb") as f:
-            f.write(file_bytes)
+def _prepare_one(
+    uploaded_file,
+    chroma_service: ChromaService,
+    chroma_lock: threading.Lock,
+    claimed_hashes: set,
+    name_lock: threading.Lock,
+) -> Dict[str, Any]:
+    """
+    Size-check, hash, save, and parse a single file ahead of indexing.
 
-        # Parse document
-        documents = parse_document(temp_path)
+    Runs on a worker thread, so it must not touch Streamlit; results are
+    reported back to the script thread through the returned status dict.
+    name_lock is shared by every upload with the same filename, since they
+    are all saved to the same path.
 
-        # Chunk documents
-        chunks = chunker.chunk_documents(documents)
+    Returns:
+        Dictionary with 'status' ("parsed", "skipped" or "too_large"), a
+        user-facing 'message', 'log' entries, and the parsed 'documents'
+    """
+    result = {"status": "parsed", "message": "", "log": [], "documents": []}
+
+    # Check file size limit before reading any bytes
+    file_size_mb = uploaded_file.size / (1024 * 1024)
+    if file_size_mb > settings.MAX_FILE_SIZE_MB:
+        result["status"] = "too_large"
+        result["message"] = (
+            f"⚠️ File '{uploaded_file.name}' is too large ({file_size_mb:.1f}MB). "
+            f"Maximum allowed size is {settings.MAX_FILE_SIZE_MB}MB."
+        )
+        return result
 
-        # Generate embeddings
-        chunk_texts = [chunk["chunk_text"] for chunk in chunks]
-        embeddings = st.session_state.embedding_service.embed_batch(chunk_texts, show_progress=False)
+    # Hash the upload before anything is written, so duplicates never touch
+    # disk. file_digest hashes in-memory uploads (BytesIO) straight from their
+    # buffer and streams file-backed ones, without buffering a copy.
+    file_hash = hashlib.file_digest(uploaded_file, "sha256").hexdigest()
+    uploaded_file.seek(0)
 
-        # Add to vector database
-        st.session_state.chroma_service.add_chunks(chunks, embeddings)
-        st.session_state.indexed_files.add(demo_file_path.name)
+    # Check if already indexed (or claimed by another file in this batch)
+    with chroma_lock:
+        already_indexed = file_hash in claimed_hashes or chroma_service.check_document_exists(file_hash)
+        claimed_hashes.add(file_hash)
 
-        logger.info(f"Auto-loaded demo content: {demo_file_path.name}")
-        return True
+    if already_indexed:
+        result["status"] = "skipped"
+        result["message"] = f"⏭️ Skipping {uploaded_file.name} (already indexed)"
+        return result
 
-    except Exception as e:
-        logger.error(f"Error auto-loading demo content: {str(e)}")
-        return False
+    tmp_path = None
+    try:
+        # Stream the upload to a temporary file in 1MB pieces and move it into
+        # place, so the saved file is never seen half-written
+        with tempfile.NamedTemporaryFile(dir=settings.UPLOAD_DIR, prefix=".upload-", delete=False) as tmp:
+            tmp_path = Path(tmp.name)
+            shutil.copyfileobj(uploaded_file, tmp, length=1 << 20)
+        file_path = settings.UPLOAD_DIR / uploaded_file.name
+
+        # Same-named uploads take turns between placing and parsing the file,
+        # so another one can't replace it before it has been read
+        with name_lock:
+            os.replace(tmp_path, file_path)
+            tmp_path = None
+            result["documents"] = parse_document(file_path)
+        result["log"].append(f"✅ Parsed {uploaded_file.name}: {len(result['documents'])} sections")
+    except Exception:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+        # Release the claim so an identical file later in the batch can still be indexed
+        with chroma_lock:
+            claimed_hashes.discard(file_hash)
+        raise
+
+    return result
 
 
 def process_uploaded_files(uploaded_files, chunk_size: int, chunk_overlap: int, openai_api_key: str, include_demo_file: bool = False):
     """Process uploaded files and add to vector database."""
     # Build list of files to process
-    files_to_process = []
+    files_to_process = list(uploaded_files or [])
 
-    # Add uploaded files
-    if uploaded_files:
-        files_to_process.extend(uploaded_files)
+    # The demo file is indexed separately, from its on-disk cache when possible
+    include_demo_file = include_demo_file and _demo_exists()
 
-    # Add demo file if selected
-    if include_demo_file:
-        demo_file_path = settings.BASE_DIR / "demo_content" / "data_scientist_onboarding.md"
-        if demo_file_path.exists():
-            # Create a pseudo uploaded file object for demo file
-            class DemoFile:
-                def __init__(self, path):
-                    self.path = path
-                    self.name = path.name
-                    self._content = None
-
-                def read(self):
-                    if self._content is None:
-                        with open(self.path, 'rb') as f:
-                            self._content = f.read()
-                    return self._content
-
-            files_to_process.append(DemoFile(demo_file_path))
-
-    if not files_to_process:
+    if not files_to_process and not include_demo_file:
         st.warning("Please upload at least one file or select the demo content.")
         return
 
@@ -213,67 +430,96 @@ def process_uploaded_files(uploaded_files, chunk_size: int, chunk_overlap: int,
     total_files = len(files_to_process)
     processed_count = 0
 
-    for idx, uploaded_file in enumerate(files_to_process):
-        try:
-            # Calculate file hash
-            file_bytes = uploaded_file.read()
-            file_hash = get_file_hash(file_bytes)
-
-            # Check file size limit
-            file_size_mb = len(file_bytes) / (1024 * 1024)
-            if file_size_mb > settings.MAX_FILE_SIZE_MB:
-                st.error(
-                    f"⚠️ File '{uploaded_file.name}' is too large ({file_size_mb:.1f}MB). "
-                    f"Maximum allowed size is {settings.MAX_FILE_SIZE_MB}MB."
-                )
-                processed_count += 1
-                progress_bar.progress(processed_count / total_files)
-                continue
-
-            # Check storage limits
-            if settings.ENABLE_AUTO_CLEANUP:
-                st.session_state.cleanup_manager.enforce_storage_limits(max_size_mb=settings.MAX_STORAGE_MB)
-
-            # Check if already indexed
-            if st.session_state.chroma_service.check_document_exists(file_hash):
-                st.info(f"⏭️ Skipping {uploaded_file.name} (already indexed)")
-                st.session_state.indexed_files.add(uploaded_file.name)
-                processed_count += 1
-                progress_bar.progress(processed_count / total_files)
-                continue
-
-            status_text.text(f"Processing {uploaded_file.name}...")
+    # Services are passed to workers explicitly: st.session_state and other
+    # Streamlit calls are only valid on the script thread
+    chroma_lock = threading.Lock()
+    claimed_hashes = set()
+    parsed_files = []
 
-            # Save file to disk
-            file_path = settings.UPLOAD_DIR / uploaded_file.name
-            with open(file_path, "wb") as f:
-                f.write(file_bytes)
+    # Check storage limits once for the whole batch rather than per file
+    if settings.ENABLE_AUTO_CLEANUP:
+        st.session_state.cleanup_manager.enforce_storage_limits(max_size_mb=settings.MAX_STORAGE_MB)
 
-            # Parse document
-            documents = parse_document(file_path)
-            st.session_state.processing_log.append(f"✅ Parsed {uploaded_file.name}: {len(documents)} sections")
-
-            # Chunk documents
-            chunks = chunker.chunk_documents(documents)
-            st.session_state.processing_log.append(f"✂️ Created {len(chunks)} chunks")
+    # Index the demo before the uploads, so an uploaded copy of it is skipped as a duplicate
+    if include_demo_file:
+        status_text.text(f"Indexing {DEMO_FILE_PATH.name}...")
+        try:
+            demo_chunks = index_demo_content(chunk_size, chunk_overlap)
+        except Exception as e:
+            st.error(f"Error processing {DEMO_FILE_PATH.name}: {str(e)}")
+            logger.error(f"Error processing {DEMO_FILE_PATH.name}: {str(e)}")
+        else:
+            if demo_chunks is None:
+                st.info(f"⏭️ Skipping {DEMO_FILE_PATH.name} (already indexed)")
+            else:
+                st.session_state.processing_log.append(f"✅ Indexed {DEMO_FILE_PATH.name}: {demo_chunks} chunks\n")
+
+    if total_files:
+        status_text.text(f"Parsing {total_files} file(s)...")
+
+    name_locks = {uploaded_file.name: threading.Lock() for uploaded_file in files_to_process}
+
+    with ThreadPoolExecutor(max_workers=settings.PROCESS_CONCURRENCY) as executor:
+        futures = {
+            executor.submit(
+                _prepare_one,
+                uploaded_file,
+                st.session_state.chroma_service,
+                chroma_lock,
+                claimed_hashes,
+                name_locks[uploaded_file.name],
+            ): uploaded_file
+            for uploaded_file in files_to_process
+        }
+
+        for future in as_completed(futures):
+            uploaded_file = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                st.error(f"Error processing {uploaded_file.name}: {str(e)}")
+                logger.error(f"Error processing {uploaded_file.name}: {str(e)}")
+                continue
 
-            # Generate embeddings
-            status_text.text(f"Generating embeddings for {uploaded_file.name}...")
-            chunk_texts = [chunk["chunk_text"] for chunk in chunks]
-            embeddings = st.session_state.embedding_service.embed_batch(chunk_texts, show_progress=False)
-            st.session_state.processing_log.append(f"🔢 Generated {len(embeddings)} embeddings")
+            st.session_state.processing_log.extend(result["log"])
 
-            # Add to vector database
-            st.session_state.chroma_service.add_chunks(chunks, embeddings)
-            st.session_state.processing_log.append(f"💾 Added to vector database\n")
+            if result["status"] == "too_large":
+                st.error(result["message"])
+            elif result["status"] == "skipped":
+                st.info(result["message"])
+                mark_indexed(uploaded_file.name)
+            else:
+                parsed_files.append((uploaded_file.name, result["documents"]))
 
-            st.session_state.indexed_files.add(uploaded_file.name)
             processed_count += 1
             progress_bar.progress(processed_count / total_files)
 
+    # Chunk every parsed file and embed them together, so small files share
+    # model batches instead of each paying for its own embed_batch call
+    if parsed_files:
+        status_text.text(f"Generating embeddings for {len(parsed_files)} file(s)...")
+        batches = chunker.iter_chunk_batches(
+            itertools.chain.from_iterable(documents for _, documents in parsed_files),
+            settings.MAX_EMBED_BATCH,
+        )
+
+        try:
+            chunk_counts = index_chunks(batches)
         except Exception as e:
-            st.error(f"Error processing {uploaded_file.name}: {str(e)}")
-            logger.error(f"Error processing {uploaded_file.name}: {str(e)}")
+            names = ", ".join(name for name, _ in parsed_files)
+            st.error(f"Error indexing {names}: {str(e)}")
+            logger.error(f"Error indexing {names}: {str(e)}")
+        else:
+            log_entries = []
+            for name, documents in parsed_files:
+                chunk_count = chunk_counts.get(documents[0]["content_hash"], 0) if documents else 0
+                log_entries.append(f"✂️ {name}: created {chunk_count} chunks")
+                mark_indexed(name)
+
+            total_chunks = sum(chunk_counts.values())
+            log_entries.append(f"🔢 Generated {total_chunks} embeddings")
+            log_entries.append(f"💾 Added to vector database\n")
+            st.session_state.processing_log.extend(log_entries)
 
     status_text.text("✅ Processing complete!")
     time.sleep(1)
@@ -353,8 +599,8 @@ def main():
     if st.sidebar.button("🗑️ Clear All Data", type="secondary"):
         if st.session_state.chroma_service:
             st.session_state.chroma_service.reset_collection()
-        st.session_state.indexed_files = set()
-        st.session_state.processing_log = []
+        st.session_state.indexed_files = []
+        st.session_state.processing_log.clear()
         st.sidebar.success("All data cleared!")
 
     # Main content tabs
@@ -365,8 +611,7 @@ def main():
         st.header("Company Knowledge Base")
 
         # Demo content section
-        demo_file_path = settings.BASE_DIR / "demo_content" / "data_scientist_onboarding.md"
-        demo_file_exists = demo_file_path.exists()
+        demo_file_exists = _demo_exists()
 
         if demo_file_exists:
             st.subheader("📋 Demo Content")
@@ -400,13 +645,15 @@ def main():
         # Show processing log
         if st.session_state.processing_log:
             with st.expander("📋 Processing Log", expanded=True):
-                for log_entry in st.session_state.processing_log[-10:]:  # Show last 10 entries
+                processing_log = st.session_state.processing_log
+                # Show last 10 entries
+                for log_entry in itertools.islice(processing_log, max(0, len(processing_log) - 10), None):
                     st.text(log_entry)
 
         # Show indexed files
         if st.session_state.indexed_files:
             st.subheader("Indexed Files")
-            for filename in sorted(st.session_state.indexed_files):
+            for filename in st.session_state.indexed_files:
                 st.text(f"✓ {filename}")
 
     # Tab 2: Ask Questions
@@ -575,14 +822,19 @@ def main():
         st.header("Demo Content Preview")
         st.info("This is the sample Data Scientist onboarding guide included with MentorBot. You can use this to test the system without uploading your own documents.")
 
-        demo_file_path = settings.BASE_DIR / "demo_content" / "data_scientist_onboarding.md"
-
-        if demo_file_path.exists():
+        if _demo_exists():
             try:
-                with open(demo_file_path, 'r', encoding='utf-8') as f:
-                    demo_content = f.read()
-
-                st.markdown(demo_content)
+                demo_content = _demo_markdown()
+
+                # Render a short preview by default; the full guide only on request
+                with st.expander("Preview", expanded=False):
+                    if len(demo_content) <= DEMO_PREVIEW_CHARS or st.session_state.get("demo_full_preview", False):
+                        st.markdown(demo_content)
+                    elif st.button("Load full preview"):
+                        st.session_state.demo_full_preview = True
+                        st.markdown(demo_content)
+                    else:
+                        st.markdown(demo_content[:DEMO_PREVIEW_CHARS] + "\n\n*…truncated…*")
 
             except Exception as e:
                 st.error(f"Error reading demo file: {str(e)}")
@@ -0,0 +1,24 @@
+"""Content hashing shared by the document parsers."""
+import hashlib
+from pathlib import Path
+from typing import Union
+
+
+def hash_content(source: Union[Path, str, bytes]) -> str:
+    """
+    Compute the SHA-256 digest stored in each parsed record's 'content_hash'.
+
+    Every parser goes through this so chunk IDs and the upload duplicate check
+    compare the same digest. Files are streamed through hashlib.file_digest.
+
+    Args:
+        source: Path to a file, or raw bytes already in memory
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(source).hexdigest()
+
+    with open(source, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
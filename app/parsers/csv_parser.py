@@ -1,55 +1,78 @@
 """CSV document parser."""
-import hashlib
 from pathlib import Path
 from typing import Dict, List
 import pandas as pd
 
+from ._hashing import hash_content
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # pandas fallback
+    pa = None
+
+# Rows/columns shown in the summary's sample table; keeps the summary chunk
+# bounded on very wide CSVs
+_PREVIEW_ROWS = 3
+_PREVIEW_COLUMNS = 20
+
 
 class CSVParser:
     """Parser for CSV documents."""
 
     @staticmethod
-    def parse(file_path: Path) -> List[Dict[str, str]]:
+    def parse(file_path: Path, use_pyarrow: bool = True) -> List[Dict[str, str]]:
         """
         Parse a CSV file and convert rows to text format.
 
         Args:
             file_path: Path to the CSV file
+            use_pyarrow: Read with PyArrow's multithreaded CSV reader when it is
+                installed; otherwise (or when False) fall back to pandas
 
         Returns:
             List of dictionaries with row-level metadata and content
         """
         try:
-            # Read CSV
-            df = pd.read_csv(file_path)
-
-            # Calculate content hash
-            with open(file_path, "rb") as f:
-                content_hash = hashlib.sha256(f.read()).hexdigest()
+            # Read CSV and build every row's text column-wise
+            if use_pyarrow and pa is not None:
+                try:
+                    num_rows, columns_info, sample, row_texts = CSVParser._read_arrow(file_path)
+                except pa.ArrowInvalid:
+                    # E.g. a column typed from the first block that turns to
+                    # text later; pandas' C engine reads the whole file first
+                    num_rows, columns_info, sample, row_texts = CSVParser._read_pandas(
+                        file_path, arrow_engine=False
+                    )
+            else:
+                num_rows, columns_info, sample, row_texts = CSVParser._read_pandas(file_path)
+
+            # Calculate content hash (streamed, computed once per file)
+            content_hash = hash_content(file_path)
 
             parsed_rows = []
 
             # First, add a summary of the CSV structure
-            summary = CSVParser._create_summary(df, file_path)
+            summary = CSVParser._create_summary(file_path, content_hash, num_rows, columns_info, sample)
             parsed_rows.append(summary)
 
             # Then add individual rows
-            for idx, row in df.iterrows():
-                # Convert row to readable text
-                row_text = CSVParser._row_to_text(row, df.columns)
-
-                parsed_rows.append(
-                    {
-                        "doc_id": file_path.stem,
-                        "filename": file_path.name,
-                        "source": str(file_path),
-                        "row": idx + 2,  # +2 because of header row and 0-indexing
-                        "total_rows": len(df) + 1,  # +1 for header
-                        "content": row_text,
-                        "content_hash": content_hash,
-                        "file_type": "csv",
-                    }
-                )
+            total_rows = num_rows + 1  # +1 for header
+
+            parsed_rows.extend(
+                {
+                    "doc_id": file_path.stem,
+                    "filename": file_path.name,
+                    "source": str(file_path),
+                    "row": idx + 2,  # +2 because of header row and 0-indexing
+                    "total_rows": total_rows,
+                    "content": row_text,
+                    "content_hash": content_hash,
+                    "file_type": "csv",
+                }
+                for idx, row_text in enumerate(row_texts)
+            )
 
             return parsed_rows
 
@@ -57,42 +80,122 @@ class CSVParser:
             raise ValueError(f"Error parsing CSV {file_path.name}: {str(e)}")
 
     @staticmethod
-    def _create_summary(df: pd.DataFrame, file_path: Path) -> Dict[str, str]:
+    def _read_arrow(file_path: Path) -> tuple:
+        """
+        Read a CSV with pyarrow.csv and build row texts with Arrow compute kernels.
+
+        Returns:
+            Tuple of (row count, column list, first rows as a DataFrame, row texts)
+        """
+        table = pacsv.read_csv(
+            file_path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 20),
+            # Quoted fields may span lines, as pandas allows
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            # Treat empty string cells as missing, like pandas does
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True),
+        )
+
+        columns = [(field.name, field.type) for field in table.schema]
+        sample = table.slice(0, _PREVIEW_ROWS).select(range(min(table.num_columns, _PREVIEW_COLUMNS))).to_pandas()
+
+        row_texts = pa.array([""] * table.num_rows, type=pa.string())
+
+        for name, column in zip(table.column_names, table.columns):
+            # "col: value" per cell; null cells become empty strings
+            part = pc.fill_null(pc.binary_join_element_wise(f"{name}: ", CSVParser._arrow_to_text(column), ""), "")
+
+            # Only insert the separator when both sides are non-empty
+            joined = pc.binary_join_element_wise(row_texts, part, " | ")
+            row_texts = pc.if_else(
+                pc.equal(row_texts, ""), part, pc.if_else(pc.equal(part, ""), row_texts, joined)
+            )
+
+        return table.num_rows, columns, sample, row_texts.to_pylist()
+
+    @staticmethod
+    def _arrow_to_text(column: "pa.ChunkedArray") -> "pa.Array":
+        """
+        Cast an Arrow column to strings, matching the text the pandas path produces.
+
+        Arrow's own float cast prints 3.0 as "3" and uses different exponent
+        cut-offs, so floats go through numpy, which formats them like Python's
+        str() (and so like pandas' astype(str)). Booleans are the one remaining
+        difference: Arrow writes "true"/"false" where pandas writes "True"/"False".
+        (pandas' C engine, the fallback on Arrow errors, also reads integer
+        columns with missing cells as floats, e.g. "1.0".)
+        """
+        if pa.types.is_floating(column.type):
+            return pa.array(column.to_numpy().astype(str), mask=column.is_null().to_numpy())
+        return pc.cast(column, pa.string())
+
+    @staticmethod
+    def _read_pandas(file_path: Path, arrow_engine: bool = True) -> tuple:
+        """
+        Read a CSV into a pandas DataFrame.
+
+        Uses pandas' multithreaded pyarrow engine with Arrow-backed dtypes when
+        pyarrow is installed and arrow_engine is True, and the default C
+        engine otherwise.
+
+        Returns:
+            Tuple of (row count, column list, first rows as a DataFrame, row texts)
+        """
+        if arrow_engine and pa is not None:
+            df = pd.read_csv(file_path, engine="pyarrow", dtype_backend="pyarrow")
+        else:
+            df = pd.read_csv(file_path)
+        columns = [(col, df[col].dtype) for col in df.columns]
+        return len(df), columns, df.iloc[:_PREVIEW_ROWS, :_PREVIEW_COLUMNS], CSVParser._rows_to_text(df)
+
+    @staticmethod
+    def _create_summary(
+        file_path: Path, content_hash: str, num_rows: int, columns: list, sample: pd.DataFrame
+    ) -> Dict[str, str]:
         """Create a summary of the CSV structure."""
-        columns_info = ", ".join([f"{col} ({df[col].dtype})" for col in df.columns])
+        columns_info = ", ".join([f"{col} ({dtype})" for col, dtype in columns])
+
+        preview = sample.iloc[:_PREVIEW_ROWS, :_PREVIEW_COLUMNS].to_string(index=False)
+        if len(columns) > _PREVIEW_COLUMNS:
+            preview += f"\n... (+{len(columns) - _PREVIEW_COLUMNS} more columns)"
 
         summary_text = f"""CSV File Summary:
 Filename: {file_path.name}
-Total Rows: {len(df)}
-Total Columns: {len(df.columns)}
+Total Rows: {num_rows}
+Total Columns: {len(columns)}
 Columns: {columns_info}
 
-Sample Data (first 3 rows):
-{df.head(3).to_string(index=False)}
+Sample Data (first {_PREVIEW_ROWS} rows):
+{preview}
 """
 
-        with open(file_path, "rb") as f:
-            content_hash = hashlib.sha256(f.read()).hexdigest()
-
         return {
             "doc_id": file_path.stem,
             "filename": file_path.name,
             "source": str(file_path),
             "row": 0,  # Summary row
-            "total_rows": len(df) + 1,
+            "total_rows": num_rows + 1,
             "content": summary_text,
             "content_hash": content_hash,
             "file_type": "csv",
         }
 
     @staticmethod
-    def _row_to_text(row: pd.Series, columns: pd.Index) -> str:
-        """Convert a DataFrame row to readable text."""
-        parts = []
-        for col in columns:
-            value = row[col]
-            # Skip NaN values
-            if pd.notna(value):
-                parts.append(f"{col}: {value}")
-
-        return " | ".join(parts)
+    def _rows_to_text(df: pd.DataFrame) -> pd.Series:
+        """
+        Convert every DataFrame row to readable "col: value | ..." text.
+
+        Works one column at a time with vectorized string ops instead of
+        iterating rows; NaN cells are skipped.
+        """
+        row_texts = pd.Series("", index=df.index, dtype=object)
+
+        for col in df.columns:
+            values = df[col]
+            part = (f"{col}: " + values.astype(str)).where(values.notna(), "").astype(object)
+
+            # Only insert the separator when both sides are non-empty
+            both = (row_texts != "") & (part != "")
+            row_texts = (row_texts + " | " + part).where(both, row_texts + part)
+
+        return row_texts
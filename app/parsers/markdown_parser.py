@@ -1,9 +1,14 @@
 """Markdown document parser."""
-import hashlib
-import re
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
+from ._hashing import hash_content
+
+# Files at least this large are hashed on a helper thread; for smaller ones
+# starting the thread costs more than the overlap saves
+_BACKGROUND_HASH_MIN_BYTES = 1 << 20
+
 
 class MarkdownParser:
     """Parser for Markdown documents."""
@@ -20,23 +25,34 @@ class MarkdownParser:
             List of dictionaries with section-level metadata and content
         """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Calculate content hash
-            content_hash = hashlib.sha256(content.encode()).hexdigest()
-
-            # Split by headers (# Header) to get sections
-            sections = MarkdownParser._split_by_sections(content)
+            with open(file_path, "rb") as f:
+                raw = f.read()
+
+            if len(raw) >= _BACKGROUND_HASH_MIN_BYTES:
+                # hashlib releases the GIL on large buffers, so the hash runs
+                # alongside decoding and section splitting
+                with ThreadPoolExecutor(max_workers=1) as hasher:
+                    hash_future = hasher.submit(hash_content, raw)
+                    content, sections = MarkdownParser._decode_and_split(raw)
+                    content_hash = hash_future.result()
+            else:
+                # Hash the bytes already in memory instead of re-encoding the text
+                content_hash = hash_content(raw)
+                content, sections = MarkdownParser._decode_and_split(raw)
+
+            # Computed once so every section dict shares the same strings
+            doc_id = file_path.stem
+            filename = file_path.name
+            source = str(file_path)
 
             parsed_sections = []
             for idx, (section_title, section_content) in enumerate(sections, start=1):
                 if section_content.strip():
                     parsed_sections.append(
                         {
-                            "doc_id": file_path.stem,
-                            "filename": file_path.name,
-                            "source": str(file_path),
+                            "doc_id": doc_id,
+                            "filename": filename,
+                            "source": source,
                             "section": section_title or f"Section {idx}",
                             "section_number": idx,
                             "content": section_content,
@@ -49,9 +65,9 @@ class MarkdownParser:
             if not parsed_sections:
                 parsed_sections.append(
                     {
-                        "doc_id": file_path.stem,
-                        "filename": file_path.name,
-                        "source": str(file_path),
+                        "doc_id": doc_id,
+                        "filename": filename,
+                        "source": source,
                         "section": "Full Document",
                         "section_number": 1,
                         "content": content,
@@ -65,6 +81,20 @@ class MarkdownParser:
         except Exception as e:
             raise ValueError(f"Error parsing Markdown {file_path.name}: {str(e)}")
 
+    @staticmethod
+    def _decode_and_split(raw: bytes) -> tuple:
+        """
+        Decode a Markdown file's bytes and split the text by headers.
+
+        Returns:
+            Tuple of (decoded text, list of (header_title, section_content) tuples)
+        """
+        # Same newline handling as reading in text mode
+        content = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+        # Split by headers (# Header) to get sections
+        return content, MarkdownParser._split_by_sections(content)
+
     @staticmethod
     def _split_by_sections(content: str) -> List[tuple]:
         """
@@ -73,27 +103,28 @@ class MarkdownParser:
         Returns:
             List of (header_title, section_content) tuples
         """
-        # Pattern to match markdown headers (# Header)
-        header_pattern = re.compile(r"^(#{1,6})\s+(.+)$", re.MULTILINE)
-
         sections = []
-        last_pos = 0
-        last_title = None
-
-        for match in header_pattern.finditer(content):
-            # Add previous section if exists
-            if last_pos > 0:
-                section_content = content[last_pos : match.start()].strip()
-                sections.append((last_title, section_content))
-
-            last_title = match.group(2).strip()
-            last_pos = match.end()
-
-        # Add last section
-        if last_pos > 0:
-            section_content = content[last_pos:].strip()
-            sections.append((last_title, section_content))
-        elif not sections:
+        title = None
+        body = None  # Lines of the current section; None until the first header
+
+        # One pass over the lines; content before the first header is dropped
+        for line in content.split("\n"):
+            if line.startswith("#"):
+                hashes = len(line) - len(line.lstrip("#"))
+                # 1-6 '#'s, whitespace, then a non-empty title
+                if hashes <= 6 and len(line) > hashes + 1 and line[hashes].isspace():
+                    if body is not None:
+                        sections.append((title, "\n".join(body).strip()))
+                    title = line[hashes:].strip()
+                    body = []
+                    continue
+
+            if body is not None:
+                body.append(line)
+
+        if body is not None:
+            sections.append((title, "\n".join(body).strip()))
+        else:
             # No headers found, return full content
             sections.append((None, content))
 
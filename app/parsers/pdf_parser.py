@@ -1,43 +1,86 @@
 """PDF document parser."""
-import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 from pypdf import PdfReader
 
+from ._hashing import hash_content
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # pypdf fallback
+    pdfium = None
+
+# PDFium is not thread-safe; upload worker threads take turns with it
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _extract_pages(path: str, backend: str) -> List[str]:
+    """Extract the text of every page of a PDF, in page order."""
+    if backend == "pdfium":
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(path)
+            try:
+                texts = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    # PDFium ends lines with \r\n
+                    texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                    textpage.close()
+                    page.close()
+                return texts
+            finally:
+                pdf.close()
+    return [page.extract_text() for page in PdfReader(path).pages]
+
 
 class PDFParser:
     """Parser for PDF documents."""
 
     @staticmethod
-    def parse(file_path: Path) -> List[Dict[str, str]]:
+    def parse(file_path: Path, backend: str = "pdfium") -> List[Dict[str, str]]:
         """
         Parse a PDF file and extract text content by page.
 
         Args:
             file_path: Path to the PDF file
+            backend: "pdfium" (PDFium's C++ extractor via pypdfium2) or "pypdf";
+                falls back to pypdf when pypdfium2 is not installed
 
         Returns:
             List of dictionaries with page-level metadata and content
         """
+        if backend not in ("pdfium", "pypdf"):
+            raise ValueError(f"Unknown PDF backend: {backend}")
+        if backend == "pdfium" and pdfium is None:
+            backend = "pypdf"
+
         try:
-            reader = PdfReader(str(file_path))
-            pages = []
+            path = str(file_path)
 
-            # Calculate content hash for the entire file
-            with open(file_path, "rb") as f:
-                content_hash = hashlib.sha256(f.read()).hexdigest()
+            # Calculate content hash for the entire file while pages are extracted
+            with ThreadPoolExecutor(max_workers=1) as hasher:
+                hash_future = hasher.submit(hash_content, file_path)
+                texts = _extract_pages(path, backend)
+                content_hash = hash_future.result()
 
-            for page_num, page in enumerate(reader.pages, start=1):
-                text = page.extract_text()
+            total_pages = len(texts)
 
+            # Computed once so every page dict shares the same strings
+            doc_id = file_path.stem
+            filename = file_path.name
+
+            pages = []
+            for page_num, text in enumerate(texts, start=1):
                 if text.strip():  # Only include pages with text
                     pages.append(
                         {
-                            "doc_id": file_path.stem,
-                            "filename": file_path.name,
-                            "source": str(file_path),
+                            "doc_id": doc_id,
+                            "filename": filename,
+                            "source": path,
                             "page": page_num,
-                            "total_pages": len(reader.pages),
+                            "total_pages": total_pages,
                             "content": text,
                             "content_hash": content_hash,
                             "file_type": "pdf",
@@ -1,10 +1,16 @@
 """Question answering service using OpenAI."""
 from typing import Dict, List, Any, Optional
+import httpx
 from openai import OpenAI
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Connection pool for the OpenAI client: kept-alive connections let
+# consecutive requests skip TCP and TLS setup
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_HTTP_TIMEOUT = 60.0
+
 
 class QAService:
     """Service for answering questions using retrieved context."""
@@ -19,6 +25,14 @@ IMPORTANT RULES:
 5. If the context is ambiguous or incomplete, say so clearly
 6. Be concise but thorough in your answers"""
 
+    # Static start of every user message, ahead of the per-question context.
+    # OpenAI only caches prompts of 1024+ tokens, and this prefix plus
+    # SYSTEM_PROMPT is ~150 tokens, so the shared prefix saves little even
+    # when retrieved context pushes a request past the threshold.
+    USER_PROMPT_PREFIX = """Answer the question using ONLY the context provided below. Include source references.
+
+"""
+
     def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", temperature: float = 0.1, max_tokens: int = 1000):
         """
         Initialize the QA service.
@@ -29,7 +43,12 @@ IMPORTANT RULES:
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
         """
-        self.client = OpenAI(api_key=api_key)
+        # One client per service with its own keep-alive pool, reused for every request
+        self.client = OpenAI(
+            api_key=api_key,
+            max_retries=2,
+            http_client=httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+        )
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
@@ -53,49 +72,76 @@ IMPORTANT RULES:
             Dictionary with answer and citations
         """
         if not retrieved_chunks:
-            return {
-                "answer": "Not found in uploaded documents. Please upload relevant documents first.",
-                "citations": [],
-                "sources": [],
-            }
-
-        # Build context from retrieved chunks
-        context = self._build_context(retrieved_chunks, metadatas)
-
-        # Create user prompt
-        user_prompt = f"""Context from uploaded documents:
-{context}
-
-Question: {question}
-
-Answer the question using ONLY the context provided above. Include source references."""
+            return self._no_context_result()
 
         try:
             # Call OpenAI API
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": self.SYSTEM_PROMPT},
-                    {"role": "user", "content": user_prompt},
-                ],
+                messages=self._build_messages(question, retrieved_chunks, metadatas),
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
             )
+            return self._answer_result(response, retrieved_chunks, metadatas)
 
-            answer = response.choices[0].message.content.strip()
+        except Exception as e:
+            return self._error_result(e)
 
-            # Extract citations
-            citations = self._extract_citations(metadatas)
+    def _build_messages(
+        self, question: str, retrieved_chunks: List[str], metadatas: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """
+        Build the chat messages for one question.
 
-            return {"answer": answer, "citations": citations, "sources": retrieved_chunks}
+        Args:
+            question: User's question
+            retrieved_chunks: List of retrieved text chunks
+            metadatas: List of metadata for each chunk
 
-        except Exception as e:
-            logger.error(f"Error calling OpenAI API: {str(e)}")
-            return {
-                "answer": f"Error generating answer: {str(e)}",
-                "citations": [],
-                "sources": [],
-            }
+        Returns:
+            System and user messages for chat.completions.create
+        """
+        # Build context from retrieved chunks
+        context = self._build_context(retrieved_chunks, metadatas)
+
+        # Create user prompt
+        user_prompt = f"""{self.USER_PROMPT_PREFIX}Context from uploaded documents:
+{context}
+
+Question: {question}"""
+
+        return [
+            {"role": "system", "content": self.SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _answer_result(self, response, retrieved_chunks: List[str], metadatas: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the answer dict from a chat completion response."""
+        answer = response.choices[0].message.content.strip()
+
+        # Extract citations
+        citations = self._extract_citations(metadatas)
+
+        return {"answer": answer, "citations": citations, "sources": retrieved_chunks}
+
+    @staticmethod
+    def _no_context_result() -> Dict[str, Any]:
+        """Answer dict for a question with no retrieved chunks."""
+        return {
+            "answer": "Not found in uploaded documents. Please upload relevant documents first.",
+            "citations": [],
+            "sources": [],
+        }
+
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        """Answer dict for a failed OpenAI call."""
+        logger.error(f"Error calling OpenAI API: {str(error)}")
+        return {
+            "answer": f"Error generating answer: {str(error)}",
+            "citations": [],
+            "sources": [],
+        }
 
     def _build_context(self, chunks: List[str], metadatas: List[Dict[str, Any]]) -> str:
         """
@@ -108,23 +154,23 @@ Answer the question using ONLY the context provided above. Include source refere
         Returns:
             Formatted context string
         """
-        context_parts = []
-
-        for i, (chunk, metadata) in enumerate(zip(chunks, metadatas), start=1):
-            # Build source info
-            source_info = self._format_source_info(metadata, i)
-
-            context_parts.append(f"[Source {i}] {source_info}\n{chunk}\n")
-
-        return "\n".join(context_parts)
-
-    def _format_source_info(self, metadata: Dict[str, Any], source_num: int) -> str:
+        # Source info is formatted at ingest time; older chunks lack it
+        format_source_info = self.format_source_info
+        return "\n".join(
+            f"[Source {i}] {metadata.get('display_source') or format_source_info(metadata)}\n{chunk}\n"
+            for i, (chunk, metadata) in enumerate(zip(chunks, metadatas), start=1)
+        )
+
+    @staticmethod
+    def format_source_info(metadata: Dict[str, Any]) -> str:
         """
         Format source information from metadata.
 
+        Called at ingest time to store each chunk's "display_source", so
+        answering a question doesn't have to format it again.
+
         Args:
-            metadata: Metadata dictionary
-            source_num: Source number for reference
+            metadata: Chunk metadata dictionary
 
         Returns:
             Formatted source string
@@ -161,11 +207,12 @@ Answer the question using ONLY the context provided above. Include source refere
         citations = []
 
         for i, metadata in enumerate(metadatas, start=1):
+            get = metadata.get
             citation = {
                 "source_number": i,
-                "filename": metadata.get("filename", "Unknown"),
-                "file_type": metadata.get("file_type", ""),
-                "chunk_id": metadata.get("doc_id", "") + f"_chunk_{i}",
+                "filename": get("filename", "Unknown"),
+                "file_type": get("file_type", ""),
+                "chunk_id": f"{get('doc_id', '')}_chunk_{i}",
             }
 
             # Add file-type specific info
@@ -1,26 +1,60 @@
 """ChromaDB vector database service."""
-from typing import Dict, List, Optional, Any
+from collections import Counter
+from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Chunks per collection.add call; keeps each SQLite transaction and the
+# per-call conversion buffers small on large ingests
+_ADD_BATCH_SIZE = 512
+
+# Metadatas fetched per page when the cached collection summaries are rebuilt
+_SCAN_PAGE_SIZE = 10_000
+
+# String metadata stored for every chunk (when non-empty)
+_STRING_METADATA_KEYS = ("doc_id", "filename", "source", "content_hash", "file_type")
+
 
 class ChromaService:
     """Service for managing ChromaDB vector database."""
 
-    def __init__(self, persist_directory: Path, collection_name: str = "rag_documents"):
+    def __init__(
+        self,
+        persist_directory: Path,
+        collection_name: str = "rag_documents",
+        space: str = "cosine",
+        construction_ef: int = 200,
+        m: int = 32,
+        search_ef: int = 100,
+    ):
         """
         Initialize ChromaDB service.
 
+        HNSW settings only apply when the collection is created; an existing
+        collection keeps the ones it was built with until it is reset.
+
         Args:
             persist_directory: Directory for ChromaDB persistence
             collection_name: Name of the collection
+            space: HNSW distance metric ("cosine", "l2" or "ip")
+            construction_ef: HNSW candidate list size while building the index
+            m: HNSW links per node
+            search_ef: HNSW candidate list size at query time
         """
         self.persist_directory = persist_directory
         self.collection_name = collection_name
+        self._collection_metadata = {
+            "description": "RAG document chunks with embeddings",
+            "hnsw:space": space,
+            "hnsw:construction_ef": construction_ef,
+            "hnsw:M": m,
+            "hnsw:search_ef": search_ef,
+        }
 
         # Initialize ChromaDB client with persistence
         self.client = chromadb.PersistentClient(
@@ -34,9 +68,24 @@ class ChromaService:
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"description": "RAG document chunks with embeddings"},
+            metadata=self._collection_metadata,
         )
 
+        existing_space = (self.collection.metadata or {}).get("hnsw:space", "l2")
+        if existing_space != space:
+            logger.warning(
+                f"Collection '{collection_name}' uses '{existing_space}' distance, not '{space}'; "
+                "reset the collection to rebuild it"
+            )
+
+        # Per-collection summaries behind check_document_exists and get_stats,
+        # rebuilt from one metadata scan whenever the collection's count
+        # stops matching _indexed_count (see _refresh_index)
+        self._indexed_count: Optional[int] = None
+        self._doc_ids = set()
+        self._content_hashes = set()
+        self._file_type_counts = Counter()
+
         logger.info(f"ChromaDB initialized at {persist_directory}")
         logger.info(f"Collection '{collection_name}' has {self.collection.count()} documents")
 
@@ -63,8 +112,9 @@ class ChromaService:
         ids = []
         documents = []
         metadatas = []
+        kept = []
 
-        for chunk, embedding in zip(chunks, embeddings):
+        for idx, chunk in enumerate(chunks):
             chunk_id = chunk.get("chunk_id", "")
             chunk_text = chunk.get("chunk_text", "")
 
@@ -72,39 +122,129 @@ class ChromaService:
                 logger.warning(f"Skipping chunk with missing id or text: {chunk}")
                 continue
 
-            # Prepare metadata (exclude large text fields)
-            metadata = {
-                "doc_id": chunk.get("doc_id", ""),
-                "filename": chunk.get("filename", ""),
-                "source": chunk.get("source", ""),
-                "content_hash": chunk.get("content_hash", ""),
-                "file_type": chunk.get("file_type", ""),
-                "chunk_index": chunk.get("chunk_index", 0),
-                "total_tokens": chunk.get("total_tokens", 0),
-            }
-
-            # Add file-type specific metadata
-            if "page" in chunk:
-                metadata["page"] = chunk["page"]
-            if "section" in chunk:
-                metadata["section"] = chunk["section"]
-            if "row" in chunk:
-                metadata["row"] = chunk["row"]
-
             ids.append(chunk_id)
             documents.append(chunk_text)
-            metadatas.append(metadata)
-
-        # Add to collection
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings[: len(ids)],  # Match the filtered length
-            documents=documents,
-            metadatas=metadatas,
-        )
+            metadatas.append(self._chunk_metadata(chunk))
+            kept.append(idx)
+
+        # Add to collection, keeping only the embeddings of the kept chunks
+        embeddings = np.asarray(embeddings, dtype=np.float32)[kept]
+        self._add_batched(ids, embeddings, documents, metadatas)
+
+        logger.info(f"Added {len(ids)} chunks to collection '{self.collection_name}'")
+
+    def add_chunks_soa(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        embeddings: Union[np.ndarray, List[List[float]]],
+    ) -> None:
+        """
+        Add chunks given as parallel lists (see TokenBasedChunker.iter_chunk_batches).
+
+        Args:
+            texts: Chunk texts
+            metadatas: Chunk metadata dicts, aligned with texts
+            ids: Chunk IDs, aligned with texts
+            embeddings: Embedding vectors, aligned with texts; a float32
+                (N, dim) array is passed to Chroma without conversion
+        """
+        if not ids or len(embeddings) == 0:
+            logger.warning("No chunks or embeddings to add")
+            return
+
+        if not len(texts) == len(metadatas) == len(ids) == len(embeddings):
+            raise ValueError(
+                f"Texts ({len(texts)}), metadatas ({len(metadatas)}), ids ({len(ids)}) and "
+                f"embeddings ({len(embeddings)}) length mismatch"
+            )
+
+        self._add_batched(ids, embeddings, texts, [self._chunk_metadata(metadata) for metadata in metadatas])
 
         logger.info(f"Added {len(ids)} chunks to collection '{self.collection_name}'")
 
+    def _add_batched(
+        self,
+        ids: List[str],
+        embeddings: Union[np.ndarray, List[List[float]]],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Add aligned chunk data to the collection in slices of _ADD_BATCH_SIZE."""
+        for start in range(0, len(ids), _ADD_BATCH_SIZE):
+            end = start + _ADD_BATCH_SIZE
+            self.collection.add(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=documents[start:end],
+                metadatas=metadatas[start:end],
+            )
+
+            if self._indexed_count is not None:
+                self._indexed_count += len(ids[start:end])
+                self._track_metadatas(metadatas[start:end])
+
+    def _track_metadatas(self, metadatas: List[Dict[str, Any]]) -> None:
+        """Fold chunk metadatas into the cached doc_id/content_hash/file_type summaries."""
+        self._doc_ids.update(metadata.get("doc_id", "") for metadata in metadatas)
+        self._doc_ids.discard("")
+        self._content_hashes.update(metadata.get("content_hash", "") for metadata in metadatas)
+        self._content_hashes.discard("")
+        self._file_type_counts.update(metadata.get("file_type", "unknown") for metadata in metadatas)
+
+    def _refresh_index(self) -> int:
+        """
+        Make the cached summaries current and return the collection's chunk count.
+
+        Writes made through this instance keep the summaries up to date. A
+        count that doesn't match (deletes, other sessions writing to the same
+        directory, or duplicate ids Chroma ignored) triggers one full rebuild.
+
+        Returns:
+            Number of chunks in the collection
+        """
+        count = self.collection.count()
+        if count != self._indexed_count:
+            self._doc_ids = set()
+            self._content_hashes = set()
+            self._file_type_counts = Counter()
+            # Page through the metadatas so a rebuild never holds them all at once
+            for offset in range(0, count, _SCAN_PAGE_SIZE):
+                page = self.collection.get(include=["metadatas"], limit=_SCAN_PAGE_SIZE, offset=offset)
+                self._track_metadatas(page["metadatas"] or [])
+            self._indexed_count = count
+        return count
+
+    @staticmethod
+    def _chunk_metadata(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the stored metadata for a chunk (large text fields excluded).
+
+        Args:
+            chunk: Chunk dictionary or chunk metadata dict
+
+        Returns:
+            Metadata dictionary for ChromaDB
+        """
+        # Empty string fields are left out rather than stored as ""; readers
+        # already fall back to defaults with .get()
+        metadata = {key: chunk[key] for key in _STRING_METADATA_KEYS if chunk.get(key)}
+        metadata["chunk_index"] = chunk.get("chunk_index", 0)
+        metadata["total_tokens"] = chunk.get("total_tokens", 0)
+
+        # Add file-type specific metadata
+        if "page" in chunk:
+            metadata["page"] = chunk["page"]
+        if "section" in chunk:
+            metadata["section"] = chunk["section"]
+        if "row" in chunk:
+            metadata["row"] = chunk["row"]
+        if "display_source" in chunk:
+            metadata["display_source"] = chunk["display_source"]
+
+        return metadata
+
     def query(
         self,
         query_embedding: List[float],
@@ -168,40 +308,65 @@ class ChromaService:
         Returns:
             Number of chunks deleted
         """
-        # Get chunks to count them
-        chunks = self.get_by_doc_id(doc_id)
-        count = len(chunks)
+        # Fetch only the IDs; documents and metadatas aren't needed to count or delete
+        ids = self.collection.get(where={"doc_id": doc_id}, include=[])["ids"]
 
-        if count > 0:
-            self.collection.delete(where={"doc_id": doc_id})
-            logger.info(f"Deleted {count} chunks for doc_id '{doc_id}'")
+        if ids:
+            self.collection.delete(ids=ids)
+            self._indexed_count = None
+            logger.info(f"Deleted {len(ids)} chunks for doc_id '{doc_id}'")
 
-        return count
+        return len(ids)
+
+    def delete_by_ids(self, ids: List[str]) -> None:
+        """
+        Delete chunks by their IDs.
+
+        Args:
+            ids: Chunk IDs to delete
+        """
+        if ids:
+            self.collection.delete(ids=ids)
+            self._indexed_count = None
+            logger.info(f"Deleted {len(ids)} chunks by id")
 
     def check_document_exists(self, content_hash: str) -> bool:
         """
         Check if a document with the given content hash exists.
 
+        Misses, the common case for new uploads, are answered from the cached
+        set of indexed content hashes after one count query (which catches
+        writes from other sessions). Hits are confirmed with a point lookup,
+        so a document deleted by another session or the cleanup job is not
+        reported as indexed even if the count happens to match.
+
         Args:
             content_hash: Content hash of the document
 
         Returns:
             True if document exists, False otherwise
         """
-        results = self.collection.get(
-            where={"content_hash": content_hash},
-            limit=1,
-        )
+        self._refresh_index()
 
-        return len(results["ids"]) > 0
+        if content_hash not in self._content_hashes:
+            return False
+
+        results = self.collection.get(where={"content_hash": content_hash}, limit=1, include=[])
+        if not results["ids"]:
+            # Stale summaries; rebuild them on next use
+            self._indexed_count = None
+            return False
+
+        return True
 
     def reset_collection(self) -> None:
         """Delete and recreate the collection."""
         self.client.delete_collection(self.collection_name)
         self.collection = self.client.create_collection(
             name=self.collection_name,
-            metadata={"description": "RAG document chunks with embeddings"},
+            metadata=self._collection_metadata,
         )
+        self._indexed_count = None
         logger.info(f"Collection '{self.collection_name}' reset")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -211,25 +376,11 @@ class ChromaService:
         Returns:
             Dictionary with collection stats
         """
-        count = self.collection.count()
-
-        # Get unique doc_ids
-        all_docs = self.collection.get(include=["metadatas"])
-        doc_ids = set()
-        file_types = {}
-
-        if all_docs["metadatas"]:
-            for metadata in all_docs["metadatas"]:
-                doc_id = metadata.get("doc_id", "")
-                if doc_id:
-                    doc_ids.add(doc_id)
-
-                file_type = metadata.get("file_type", "unknown")
-                file_types[file_type] = file_types.get(file_type, 0) + 1
+        count = self._refresh_index()
 
         return {
             "total_chunks": count,
-            "total_documents": len(doc_ids),
-            "file_types": file_types,
+            "total_documents": len(self._doc_ids),
+            "file_types": dict(self._file_type_counts),
             "collection_name": self.collection_name,
         }